@@ -5,12 +5,13 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import math
 import mimetypes
 import random
 import re
 import time
 from collections import deque
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -45,14 +46,46 @@ from nio.responses import (  # type: ignore[import-untyped]
     RoomResolveAliasResponse,
 )
 
-from beeperclaw.commands import ALL_COMMANDS, Command, CommandContext, CommandResult
+from beeperclaw.commands import (
+    ACTIVE_SESSION_STATUSES,
+    COMMAND_TABLE,
+    LONG_RUNNING_COMMANDS,
+    Command,
+    CommandContext,
+    CommandResult,
+)
 from beeperclaw.config import Config
-from beeperclaw.opencode_client import OpenCodeClient, PromptAttachment, Session
+from beeperclaw.opencode_client import OpenCodeClient, OpenCodeEvent, PromptAttachment, Session
 from beeperclaw.state import BotState, StateStore
 
 logger = logging.getLogger(__name__)
 
-ACTIVE_SESSION_STATUSES = {"running", "waiting"}
+MEDIA_EVENT_TYPES = (
+    RoomMessageImage,
+    RoomMessageFile,
+    RoomMessageVideo,
+    RoomMessageAudio,
+    RoomEncryptedImage,
+    RoomEncryptedFile,
+    RoomEncryptedVideo,
+    RoomEncryptedAudio,
+)
+# Events buffered between the OpenCode stream reader and the notification handler
+EVENT_QUEUE_SIZE = 32
+# Minimum gap between "event queue full" warnings; drops in between are counted
+EVENT_DROP_WARNING_INTERVAL_SECONDS = 30.0
+# How long a room session confirmed by OpenCode is trusted without re-fetching it
+SESSION_VERIFY_TTL_SECONDS = 30.0
+
+
+# A stream event for a pending session, paired with that session's ID
+_QueuedEvent = tuple[str, OpenCodeEvent]
+
+
+def _iter_chunks(text: str, size: int) -> Iterator[str]:
+    """Yield consecutive ``size``-length slices of ``text``."""
+    for offset in range(0, len(text), size):
+        yield text[offset : offset + size]
 
 
 @dataclass
@@ -115,21 +148,22 @@ class BeeperClawBot:
         self._attachment_dir.mkdir(parents=True, exist_ok=True)
 
         self.bot = botlib.Bot(self.creds, bot_config)
+        # Replaced by the MXID the homeserver reports once start() has logged in
+        self._bot_user_id = config.matrix.username
+
+        # Config validates the allow-list into a frozenset; None means unrestricted
+        self._allowed_users: frozenset[str] | None = config.matrix.allowed_users or None
 
-        # Register commands
-        self.commands: dict[str, Command] = {}
-        for cmd_class in ALL_COMMANDS:
-            cmd = cmd_class()
-            self.commands[cmd.name] = cmd
-            # Also register aliases
-            for alias in cmd.aliases:
-                self.commands[alias] = cmd
+        # Commands keyed by lowercased name and aliases so dispatch is a single
+        # dict lookup; the shared table is read-only
+        self.commands: Mapping[str, Command] = COMMAND_TABLE
 
         # State
         self.state_store = StateStore(config.bot.state_path)
         self.state: BotState = self.state_store.load()
         self.current_model: str | None = self.state.current_model
         self._room_sessions: dict[str, str] = dict(self.state.room_sessions)
+        self._verified_room_sessions: dict[str, tuple[float, Session]] = {}
         self._last_notified_assistant_message_by_session: dict[str, str] = dict(
             self.state.last_notified_assistant_message_by_session
         )
@@ -139,6 +173,8 @@ class BeeperClawBot:
         self._shell_room_alias: str | None = self.state.shell_room_alias
         self._last_bootstrap_attempt: float | None = self.state.last_bootstrap_attempt
         self._event_task: asyncio.Task[None] | None = None
+        self._dropped_events = 0
+        self._last_drop_warning = -math.inf
         self._dedup_enabled = config.bot.dedup_enabled and config.bot.dedup_cache_size > 0
         self._seen_event_ids: deque[str] = deque(
             maxlen=config.bot.dedup_cache_size if self._dedup_enabled else None
@@ -347,22 +383,41 @@ class BeeperClawBot:
     def _set_room_session(self, room_id: str, session: Session | None) -> None:
         if session is None:
             self._room_sessions.pop(room_id, None)
+            self._verified_room_sessions.pop(room_id, None)
         else:
             self._room_sessions[room_id] = session.id
+            self._verified_room_sessions[room_id] = (time.monotonic(), session)
         self._save_state()
 
+    def forget_room_session(self, room_id: str) -> None:
+        """Drop a room's session mapping after OpenCode reports it missing."""
+        if room_id in self._room_sessions:
+            logger.warning("Dropping stale room session mapping for %s", room_id)
+            self._set_room_session(room_id, None)
+
     async def get_session_for_room(self, room_id: str) -> Session | None:
         """Resolve the session currently mapped to a room."""
         session_id = self.get_room_session_id(room_id)
         if not session_id:
             return None
 
+        cached = self._verified_room_sessions.get(room_id)
+        if cached is not None:
+            verified_at, session = cached
+            if (
+                session.id == session_id
+                and time.monotonic() - verified_at < SESSION_VERIFY_TTL_SECONDS
+            ):
+                return session
+
         try:
-            return await self.opencode.get_session(session_id)
+            session = await self.opencode.get_session(session_id)
         except Exception:
             logger.warning("Dropping stale room session mapping for %s -> %s", room_id, session_id)
             self._set_room_session(room_id, None)
             return None
+        self._verified_room_sessions[room_id] = (time.monotonic(), session)
+        return session
 
     async def get_or_create_session_for_room(self, room_id: str) -> Session:
         """Get or create the room-scoped session."""
@@ -383,10 +438,7 @@ class BeeperClawBot:
         Returns:
             True if allowed
         """
-        allowed = self.config.matrix.allowed_users
-        if not allowed:
-            return True  # No restrictions
-        return user_id in allowed
+        return self._allowed_users is None or user_id in self._allowed_users
 
     async def handle_message(self, room: Any, event: Any) -> None:
         """Handle incoming messages.
@@ -397,17 +449,16 @@ class BeeperClawBot:
         """
         # Defensive checks
         if not hasattr(event, "sender") or not event.sender:
-            logger.info("DEBUG: Event has no sender, ignoring")
+            logger.debug("Event has no sender, ignoring")
             return
 
-        event_id = self._get_event_id(event)
-        if self._dedup_enabled and event_id:
-            if event_id in self._seen_event_ids_set:
-                logger.info(f"DEBUG: Duplicate event {event_id}, ignoring")
-                return
-            self._remember_event_id(event_id)
+        sender = event.sender
+        if sender == self._bot_user_id:
+            logger.debug("Message from bot itself, ignoring")
+            return
 
-        logger.info(f"DEBUG: handle_message called for room {room.room_id} from {event.sender}")
+        room_id = room.room_id
+        logger.debug("handle_message called for room %s from %s", room_id, sender)
 
         # Extract message body from event
         body = (
@@ -415,45 +466,39 @@ class BeeperClawBot:
             if hasattr(event, "body")
             else event.source.get("content", {}).get("body", "")
         )
-        sender = event.sender
 
         # Check if message has content
         if not body:
-            logger.info("DEBUG: Message has no body, ignoring")
+            logger.debug("Message has no body, ignoring")
             return
 
-        if self._dedup_enabled and not event_id:
-            fingerprint = self._fingerprint_message(room.room_id, sender, body)
-            if self._is_duplicate_message(fingerprint):
-                logger.info("DEBUG: Duplicate message fingerprint, ignoring")
-                return
+        # Check for command prefix before dedup and auth: most room traffic is
+        # plain chat
+        prefix = self.config.bot.prefix
+        if not body.startswith(prefix):
+            return
+        command_text = body[len(prefix) :]
 
-        # Use MessageMatch to check if message is from bot
-        try:
-            match = botlib.MessageMatch(room, event, self.bot, self.config.bot.prefix)
-            if not match.is_not_from_this_bot():
-                logger.info("DEBUG: Message from bot itself, ignoring")
-                return
-        except Exception as e:
-            logger.warning(f"DEBUG: MessageMatch error: {e}, falling back to manual check")
-            # Fallback: manually check if sender is the bot
-            if sender == self.config.matrix.username:
-                logger.info("DEBUG: Message from bot itself (manual check), ignoring")
+        event_id = self._get_event_id(event)
+        if self._dedup_enabled:
+            if event_id:
+                if event_id in self._seen_event_ids_set:
+                    logger.debug("Duplicate event %s, ignoring", event_id)
+                    return
+                self._remember_event_id(event_id)
+            elif self._is_duplicate_message(self._fingerprint_message(room_id, sender, body)):
+                logger.debug("Duplicate message fingerprint, ignoring")
                 return
 
-        logger.info(f"DEBUG: Processing message from {sender}: '{body}'")
+        logger.debug("Processing message in %s from %s: %r", room_id, sender, body)
 
         # Check if user is allowed
         if not self.is_user_allowed(sender):
-            logger.warning(f"Unauthorized user attempted to use bot: {sender}")
-            return
-
-        # Check for command prefix
-        if not body.startswith(self.config.bot.prefix):
+            logger.warning("Unauthorized user attempted to use bot: %s", sender)
             return
 
         # Parse command
-        parsed = self._parse_command(body)
+        parsed = self._parse_command(command_text)
         if parsed is None:
             return
         cmd_name, args = parsed
@@ -465,8 +510,8 @@ class BeeperClawBot:
             args=args,
         )
 
-    def _parse_command(self, body: str) -> tuple[str, str] | None:
-        parts = body[len(self.config.bot.prefix) :].split(maxsplit=1)
+    def _parse_command(self, command_text: str) -> tuple[str, str] | None:
+        parts = command_text.split(maxsplit=1)
         if not parts:
             return None
         cmd_name = parts[0].lower()
@@ -482,45 +527,47 @@ class BeeperClawBot:
         cmd_name: str,
         args: str,
     ) -> None:
+        room_id = room.room_id
+        api = self.bot.api
         cmd = self.commands.get(cmd_name)
         if cmd is None:
             if self.config.bot.unknown_command_reply:
-                await self.bot.api.send_text_message(
-                    room.room_id,
+                await api.send_text_message(
+                    room_id,
                     f"Unknown command: {cmd_name}\nUse /help to see available commands.",
                 )
             return
 
-        long_running = cmd.name in {"build", "plan"}
-        attachments = self._staged_attachments_for_room(room.room_id) if long_running else ()
-        use_typing = self.config.bot.typing_indicator and long_running
+        long_running = cmd.name in LONG_RUNNING_COMMANDS
+        attachments = self._staged_attachments_for_room(room_id) if long_running else ()
+        use_typing = long_running and self.config.bot.typing_indicator
         context = CommandContext(
-            room_id=room.room_id,
+            room_id=room_id,
             sender=sender,
             event_id=event_id,
             attachments=attachments,
         )
 
         if use_typing:
-            await self.bot.api.async_client.room_typing(room.room_id, True)
+            await api.async_client.room_typing(room_id, True)
 
         try:
             result = await cmd.execute(self, args, context)
             await self._send_result(
-                room.room_id,
+                room_id,
                 result,
                 reply_to_event_id=context.event_id if long_running else None,
             )
         except Exception as e:
-            logger.exception(f"Error executing command {cmd_name}")
-            await self.bot.api.send_text_message(
-                room.room_id,
+            logger.exception("Error executing command %s", cmd_name)
+            await api.send_text_message(
+                room_id,
                 f"Error executing command: {e}",
                 reply_to=context.event_id if long_running and context.event_id else "",
             )
         finally:
             if use_typing:
-                await self.bot.api.async_client.room_typing(room.room_id, False)
+                await api.async_client.room_typing(room_id, False)
 
     def _attachment_caption(self, event: Any) -> str | None:
         content = getattr(event, "source", {}).get("content", {})
@@ -633,7 +680,7 @@ class BeeperClawBot:
                 return
             self._remember_event_id(event_id)
 
-        if sender == self.config.matrix.username:
+        if sender == self._bot_user_id:
             return
         if not self.is_user_allowed(sender):
             logger.warning("Unauthorized user attempted to upload attachment: %s", sender)
@@ -659,12 +706,13 @@ class BeeperClawBot:
 
         self._stage_attachment(room.room_id, attachment)
         caption = attachment.caption or ""
-        if caption.startswith(self.config.bot.prefix):
-            parsed = self._parse_command(caption)
+        prefix = self.config.bot.prefix
+        if caption.startswith(prefix):
+            parsed = self._parse_command(caption[len(prefix) :])
             if parsed is not None:
                 cmd_name, args = parsed
                 cmd = self.commands.get(cmd_name)
-                if cmd is not None and cmd.name in {"build", "plan"}:
+                if cmd is not None and cmd.name in LONG_RUNNING_COMMANDS:
                     await self._execute_command(
                         room=room,
                         sender=sender,
@@ -755,7 +803,11 @@ class BeeperClawBot:
                     sleep_for = delay
                     jitter = random.uniform(0, 0.5)
                     logger.warning(
-                        f"{label} rate limited (attempt {attempt}/{max_retries}), retrying in {sleep_for:.2f}s"
+                        "%s rate limited (attempt %s/%s), retrying in %.2fs",
+                        label,
+                        attempt,
+                        max_retries,
+                        sleep_for,
                     )
                     await asyncio.sleep(sleep_for + jitter)
                     delay = min(delay * 2, 30.0)
@@ -768,12 +820,16 @@ class BeeperClawBot:
             sleep_for = retry_after if retry_after > 0 else delay
             jitter = random.uniform(0, 0.5)
             logger.warning(
-                f"{label} rate limited (attempt {attempt}/{max_retries}), retrying in {sleep_for:.2f}s"
+                "%s rate limited (attempt %s/%s), retrying in %.2fs",
+                label,
+                attempt,
+                max_retries,
+                sleep_for,
             )
             await asyncio.sleep(sleep_for + jitter)
             delay = min(delay * 2, 30.0)
 
-        logger.error(f"{label} failed after {max_retries} attempts due to rate limiting")
+        logger.error("%s failed after %s attempts due to rate limiting", label, max_retries)
         return last_response
 
     async def _resolve_room_alias(self, alias: str) -> str | None:
@@ -799,18 +855,18 @@ class BeeperClawBot:
         self._save_state()
 
         if self._shell_room_id:
-            logger.info(f"Shell room already recorded: {self._shell_room_id}")
+            logger.info("Shell room already recorded: %s", self._shell_room_id)
             return
 
         if self._shell_room_alias and self._shell_room_alias != alias:
             logger.info(
-                f"Shell room alias changed from {self._shell_room_alias} to {alias}, rechecking"
+                "Shell room alias changed from %s to %s, rechecking", self._shell_room_alias, alias
             )
             self._shell_room_alias = alias
             self._save_state()
         existing_room_id = await self._resolve_room_alias(alias)
         if existing_room_id:
-            logger.info(f"Shell room already exists: {existing_room_id}")
+            logger.info("Shell room already exists: %s", existing_room_id)
             self._shell_room_id = existing_room_id
             self._shell_room_alias = alias
             self._save_state()
@@ -826,7 +882,7 @@ class BeeperClawBot:
         )
 
         if isinstance(response, RoomCreateError):
-            logger.error(f"Room create failed: {response}")
+            logger.error("Room create failed: %s", response)
             return
 
         if isinstance(response, RoomCreateResponse):
@@ -835,46 +891,53 @@ class BeeperClawBot:
             room_id = getattr(response, "room_id", None)
 
         if not room_id:
-            logger.error(f"Room create returned no room_id: {response}")
+            logger.error("Room create returned no room_id: %s", response)
             return
 
         self._shell_room_id = room_id
         self._shell_room_alias = alias
         self._save_state()
 
-        logger.info(f"Created room: {room_id}")
+        logger.info("Created room: %s", room_id)
 
-        alias_resp = await self._retry_matrix_call(
-            "Room alias",
-            self.bot.api.async_client.room_put_alias,
-            room_alias=alias,
-            room_id=room_id,
+        # Setting the alias and inviting users are independent of each other
+        async_client = self.bot.api.async_client
+        invitees: list[str] = sorted(self.config.matrix.allowed_users or ())
+        alias_resp, *invite_resps = await asyncio.gather(
+            self._retry_matrix_call(
+                "Room alias",
+                async_client.room_put_alias,
+                room_alias=alias,
+                room_id=room_id,
+            ),
+            *(
+                self._retry_matrix_call(
+                    f"Invite {user_id}",
+                    async_client.room_invite,
+                    room_id=room_id,
+                    user_id=user_id,
+                )
+                for user_id in invitees
+            ),
         )
 
         if isinstance(alias_resp, RoomPutAliasError):
-            logger.error(f"Failed to set room alias: {alias_resp}")
+            logger.error("Failed to set room alias: %s", alias_resp)
         else:
-            logger.info(f"Alias response: {alias_resp}")
+            logger.info("Alias response: %s", alias_resp)
 
         logger.info("==================================================")
-        logger.info(f"JOIN LINK: https://matrix.to/#/{alias}")
-        logger.info(f"ROOM ID: {room_id}")
+        logger.info("JOIN LINK: https://matrix.to/#/%s", alias)
+        logger.info("ROOM ID: %s", room_id)
         logger.info("==================================================")
 
-        invitees: Iterable[str] = self.config.matrix.allowed_users or []
-        for user_id in invitees:
-            invite_resp = await self._retry_matrix_call(
-                f"Invite {user_id}",
-                self.bot.api.async_client.room_invite,
-                room_id=room_id,
-                user_id=user_id,
-            )
+        for user_id, invite_resp in zip(invitees, invite_resps, strict=True):
             if isinstance(invite_resp, RoomInviteError):
-                logger.error(f"Invite failed for {user_id}: {invite_resp}")
+                logger.error("Invite failed for %s: %s", user_id, invite_resp)
             elif isinstance(invite_resp, RoomInviteResponse):
-                logger.info(f"Invited {user_id} to room {room_id}")
+                logger.info("Invited %s to room %s", user_id, room_id)
             else:
-                logger.info(f"Invite response for {user_id}: {invite_resp}")
+                logger.info("Invite response for %s: %s", user_id, invite_resp)
 
     async def _send_markdown_message(
         self, room_id: str, message: str, *, reply_to_event_id: str | None = None
@@ -903,13 +966,14 @@ class BeeperClawBot:
     ) -> None:
         """Send a command result to a room."""
         message = result.message
+        if not message:
+            return
         max_len = self.config.bot.max_message_length
-        parts = [message[i : i + max_len] for i in range(0, len(message), max_len)]
-        for index, part in enumerate(parts):
+        # Parts are sent one at a time: each is a raw slice of the message, so the
+        # room must receive them in order. Only the first part carries the reply.
+        for index, part in enumerate(_iter_chunks(message, max_len)):
             await self._send_markdown_message(
-                room_id,
-                part,
-                reply_to_event_id=reply_to_event_id if index == 0 else None,
+                room_id, part, reply_to_event_id=reply_to_event_id if index == 0 else None
             )
 
     async def _recover_pending_runs(self) -> None:
@@ -1009,101 +1073,138 @@ class BeeperClawBot:
         )
 
     async def _monitor_events(self) -> None:
-        """Monitor OpenCode events and notify users of completions."""
-        try:
-            async for event in self.opencode.subscribe_events():
-                session_id = self.opencode.extract_session_id_from_event(event)
-                if session_id is None or session_id not in self._pending_runs:
-                    continue
-
-                assistant_message = self.opencode.extract_assistant_message_from_event(event)
-                if assistant_message is not None:
-                    if self._assistant_message_already_notified(session_id, assistant_message.id):
-                        self.clear_pending_run(session_id)
-                        continue
-                    pending = self._pending_runs.get(session_id)
-                    if pending is None:
-                        continue
-                    await self._notify_completion(
-                        session_id,
-                        pending,
-                        body=self.opencode.get_message_text(assistant_message),
-                        state="completed",
-                        assistant_message_id=assistant_message.id,
-                    )
-                    continue
-
-                await self._maybe_notify_terminal_session(session_id)
+        """Monitor OpenCode events and notify users of completions.
 
+        The stream reader and the notification handler run as separate tasks joined
+        by a bounded queue, so slow Matrix sends never stall reading the stream.
+        """
+        queue: asyncio.Queue[_QueuedEvent | None] = asyncio.Queue(maxsize=EVENT_QUEUE_SIZE)
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._process_events(queue))
+                await self._read_events(queue)
         except asyncio.CancelledError:
             pass
         except Exception as e:
-            logger.exception(f"Error monitoring events: {e}")
+            logger.exception("Error monitoring events: %s", e)
 
-    async def start(self) -> None:
-        """Start the bot."""
-        logger.info("Starting beeperclaw bot...")
-
-        # Verify OpenCode connection
+    async def _read_events(self, queue: asyncio.Queue[_QueuedEvent | None]) -> None:
+        opencode = self.opencode
+        pending_runs = self._pending_runs
         try:
-            health = await self.opencode.health_check()
-            logger.info(f"Connected to OpenCode server: {health.get('version', 'unknown')}")
-        except Exception as e:
-            logger.error(f"Failed to connect to OpenCode server: {e}")
-            raise
+            async for event in opencode.subscribe_events():
+                # Most events arrive while nothing is pending; skip them before
+                # any payload parsing
+                if not pending_runs:
+                    continue
+                # Only queue events for pending sessions, so ordinary streaming from
+                # other sessions cannot fill the queue
+                session_id = opencode.extract_session_id_from_event(event)
+                if session_id is None or session_id not in pending_runs:
+                    continue
+                self._enqueue_event(queue, (session_id, event))
+        finally:
+            # Sentinel: lets the handler drain what is queued and exit
+            self._enqueue_event(queue, None)
 
-        # Run the bot
-        logger.info("Bot is running. Waiting for messages...")
-        await self.bot.api.login()
-
-        # Register message handler
-        async def on_message(room: Any, event: Any) -> None:
-            await self.handle_message(room, event)
-
-        self.bot.api.async_client.add_event_callback(on_message, RoomMessageText)
-
-        async def on_media(room: Any, event: Any) -> None:
-            await self.handle_media_message(room, event)
-
-        media_event_types = (
-            RoomMessageImage,
-            RoomMessageFile,
-            RoomMessageVideo,
-            RoomMessageAudio,
-            RoomEncryptedImage,
-            RoomEncryptedFile,
-            RoomEncryptedVideo,
-            RoomEncryptedAudio,
-        )
-        for event_type in media_event_types:
-            self.bot.api.async_client.add_event_callback(on_media, event_type)
+    def _enqueue_event(
+        self, queue: asyncio.Queue[_QueuedEvent | None], item: _QueuedEvent | None
+    ) -> None:
+        if queue.full():
+            queue.get_nowait()
+            self._dropped_events += 1
+            now = time.monotonic()
+            if now - self._last_drop_warning >= EVENT_DROP_WARNING_INTERVAL_SECONDS:
+                logger.warning(
+                    "OpenCode event queue full, dropped %d oldest event(s)", self._dropped_events
+                )
+                self._dropped_events = 0
+                self._last_drop_warning = now
+        queue.put_nowait(item)
+
+    async def _process_events(self, queue: asyncio.Queue[_QueuedEvent | None]) -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            session_id, event = item
+            try:
+                await self._handle_opencode_event(session_id, event)
+            except Exception:
+                logger.exception("Failed to handle OpenCode event %s", event.type)
+
+    async def _handle_opencode_event(self, session_id: str, event: OpenCodeEvent) -> None:
+        opencode = self.opencode
+        pending_runs = self._pending_runs
+        if session_id not in pending_runs:
+            return
 
-        # Register invite handler
-        async def on_invite(room: Any, event: Any) -> None:
-            if not isinstance(event, InviteMemberEvent):
+        assistant_message = opencode.extract_assistant_message_from_event(event)
+        if assistant_message is not None:
+            if self._assistant_message_already_notified(session_id, assistant_message.id):
+                self.clear_pending_run(session_id)
                 return
-            sender = event.sender
-            if self.is_user_allowed(sender):
-                logger.info(f"Joining room {room.room_id} invited by {sender}")
-                await self.bot.api.async_client.join(room.room_id)
-            else:
-                logger.warning(f"Ignoring invite from {sender} to {room.room_id}")
+            pending = pending_runs.get(session_id)
+            if pending is None:
+                return
+            await self._notify_completion(
+                session_id,
+                pending,
+                body=opencode.get_message_text(assistant_message),
+                state="completed",
+                assistant_message_id=assistant_message.id,
+            )
+            return
 
-        self.bot.api.async_client.add_event_callback(on_invite, InviteMemberEvent)
+        await self._maybe_notify_terminal_session(session_id)
 
-        # Debug: Log encrypted events
-        async def on_encrypted(room: Any, event: MegolmEvent) -> None:
-            logger.info(f"DEBUG: Received Encrypted Event in {room.room_id} from {event.sender}")
+    async def _on_invite(self, room: Any, event: Any) -> None:
+        """Join rooms that allowed users invite the bot to."""
+        if not isinstance(event, InviteMemberEvent):
+            return
+        sender = event.sender
+        if self.is_user_allowed(sender):
+            logger.info("Joining room %s invited by %s", room.room_id, sender)
+            await self.bot.api.async_client.join(room.room_id)
+        else:
+            logger.warning("Ignoring invite from %s to %s", sender, room.room_id)
 
-        self.bot.api.async_client.add_event_callback(on_encrypted, MegolmEvent)
+    async def _on_encrypted(self, room: Any, event: MegolmEvent) -> None:
+        """Log encrypted events the bot could not decrypt."""
+        logger.debug("Received encrypted event in %s from %s", room.room_id, event.sender)
 
-        # Debug: Log decrypted text events
-        async def on_text_debug(room: Any, event: RoomMessageText) -> None:
-            logger.info(
-                f"DEBUG: Received Decrypted Text in {room.room_id} from {event.sender}: '{event.body}'"
-            )
+    async def _verify_opencode(self) -> None:
+        try:
+            health = await self.opencode.health_check()
+            logger.info("Connected to OpenCode server: %s", health.get("version", "unknown"))
+        except Exception as e:
+            logger.error("Failed to connect to OpenCode server: %s", e)
+            raise
+
+    async def start(self) -> None:
+        """Start the bot."""
+        logger.info("Starting beeperclaw bot...")
+
+        # Verify the OpenCode connection and log in to Matrix concurrently; if either
+        # fails, the task group cancels the other before the error propagates
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._verify_opencode())
+                group.create_task(self.bot.api.login())
+        except ExceptionGroup as errors:
+            raise errors.exceptions[0] from None
+        # Own-message filtering must match the server's canonical MXID, which can
+        # differ from a configured localpart
+        self._bot_user_id = self.bot.api.async_client.user_id or self._bot_user_id
+        logger.info("Bot is running. Waiting for messages...")
 
-        self.bot.api.async_client.add_event_callback(on_text_debug, RoomMessageText)
+        # Register handlers as bound methods
+        async_client = self.bot.api.async_client
+        async_client.add_event_callback(self.handle_message, RoomMessageText)
+        for event_type in MEDIA_EVENT_TYPES:
+            async_client.add_event_callback(self.handle_media_message, event_type)
+        async_client.add_event_callback(self._on_invite, InviteMemberEvent)
+        async_client.add_event_callback(self._on_encrypted, MegolmEvent)
 
         try:
             await self._recover_pending_runs()
@@ -1117,7 +1218,7 @@ class BeeperClawBot:
         try:
             await self._bootstrap_shell_room()
         except Exception as e:
-            logger.error(f"Bootstrap error: {e}")
+            logger.error("Bootstrap error: %s", e)
 
         await self.bot.api.async_client.sync_forever(timeout=30000)
 
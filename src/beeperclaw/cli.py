@@ -4,10 +4,12 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import shutil
 import sys
 from pathlib import Path
 
 import click
+import httpx
 from rich.console import Console
 from rich.logging import RichHandler
 
@@ -117,8 +119,6 @@ def init(output: Path) -> None:
     # Copy example config
     example_path = Path(__file__).parent.parent.parent.parent / "config.example.yaml"
     if example_path.exists():
-        import shutil
-
         shutil.copy(example_path, output)
         console.print(f"[green]Created config file:[/green] {output}")
     else:
@@ -164,48 +164,53 @@ def check(config: Path | None) -> None:
         console.print(f"[red]Config error:[/red] {e}")
         sys.exit(1)
 
-    # Check OpenCode connection
-    console.print(f"\nChecking OpenCode server at {cfg.opencode.server_url}...")
-
-    async def check_opencode() -> None:
-        from beeperclaw.opencode_client import OpenCodeClient
+    from beeperclaw.opencode_client import OpenCodeClient
 
-        client = OpenCodeClient(cfg.opencode.server_url)
+    # Probe OpenCode and Antigravity concurrently, then report in a stable order
+    async def check_opencode(client: OpenCodeClient) -> list[str]:
+        lines = [f"\nChecking OpenCode server at {cfg.opencode.server_url}..."]
         try:
             health = await client.health_check()
-            console.print(
+            lines.append(
                 f"[green]OpenCode connected[/green] - version {health.get('version', 'unknown')}"
             )
 
             # List agents
             agents = await client.list_agents()
-            console.print(f"  Available agents: {', '.join(a.get('name', '?') for a in agents)}")
+            lines.append(f"  Available agents: {', '.join(a.get('name', '?') for a in agents)}")
         except Exception as e:
-            console.print(f"[red]OpenCode connection failed:[/red] {e}")
-        finally:
-            await client.close()
-
-    asyncio.run(check_opencode())
-
-    # Check Antigravity if configured
-    if cfg.providers.primary == "antigravity":
-        console.print(f"\nChecking Antigravity Manager at {cfg.providers.antigravity.base_url}...")
-        import httpx
+            lines.append(f"[red]OpenCode connection failed:[/red] {e}")
+        return lines
 
+    async def check_antigravity() -> list[str]:
+        antigravity = cfg.providers.antigravity
+        lines = [f"\nChecking Antigravity Manager at {antigravity.base_url}..."]
         try:
-            response = httpx.get(
-                f"{cfg.providers.antigravity.base_url}/models",
-                headers={"Authorization": f"Bearer {cfg.providers.antigravity.api_key}"},
-                timeout=5.0,
-            )
+            async with httpx.AsyncClient(timeout=5.0) as client:
+                response = await client.get(
+                    f"{antigravity.base_url}/models",
+                    headers={"Authorization": f"Bearer {antigravity.api_key}"},
+                )
             if response.status_code == 200:
-                console.print("[green]Antigravity Manager connected[/green]")
+                lines.append("[green]Antigravity Manager connected[/green]")
             else:
-                console.print(
-                    f"[yellow]Antigravity returned status {response.status_code}[/yellow]"
-                )
+                lines.append(f"[yellow]Antigravity returned status {response.status_code}[/yellow]")
         except Exception as e:
-            console.print(f"[red]Antigravity connection failed:[/red] {e}")
+            lines.append(f"[red]Antigravity connection failed:[/red] {e}")
+        return lines
+
+    async def run_checks() -> list[list[str]]:
+        # One client per invocation so every OpenCode probe shares its connection pool
+        async with OpenCodeClient(cfg.opencode.server_url) as client:
+            probes = [check_opencode(client)]
+            # Check Antigravity if configured
+            if cfg.providers.primary == "antigravity":
+                probes.append(check_antigravity())
+            return await asyncio.gather(*probes)
+
+    for lines in asyncio.run(run_checks()):
+        for line in lines:
+            console.print(line)
 
     console.print("\n[green]All checks complete![/green]")
 
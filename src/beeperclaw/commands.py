@@ -4,7 +4,10 @@ from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import cached_property
+from types import MappingProxyType
 from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
@@ -14,6 +17,11 @@ from beeperclaw.opencode_client import OpenCodeAPIError, OpenCodeRateLimitError,
 
 logger = logging.getLogger(__name__)
 
+# OpenCode session states that mean a task is still in flight
+ACTIVE_SESSION_STATUSES = frozenset({"running", "waiting"})
+# Commands that start OpenCode tasks and consume staged attachments
+LONG_RUNNING_COMMANDS = frozenset({"build", "plan"})
+
 
 def format_opencode_error(exc: OpenCodeAPIError) -> str:
     """Format OpenCode API errors for user-facing messages."""
@@ -26,7 +34,7 @@ def format_opencode_error(exc: OpenCodeAPIError) -> str:
     return f"OpenCode API error: {exc}"
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CommandResult:
     """Result of a command execution."""
 
@@ -53,6 +61,12 @@ class Command(ABC):
     usage: str
     aliases: list[str] = []
 
+    @cached_property
+    def help_text(self) -> str:
+        """Detailed help shown by ``/help <command>``."""
+        aliases = f" (aliases: {', '.join(self.aliases)})" if self.aliases else ""
+        return f"**/{self.name}**{aliases}\n\n{self.description}\n\nUsage: `{self.usage}`"
+
     @abstractmethod
     async def execute(
         self, bot: BeeperClawBot, args: str, context: CommandContext
@@ -138,6 +152,8 @@ class BuildCommand(Command):
             )
         except OpenCodeAPIError as e:
             logger.exception("Failed to execute build command")
+            if e.status_code == 404:
+                bot.forget_room_session(context.room_id)
             return CommandResult(
                 success=False,
                 message=f"Failed to start task: {format_opencode_error(e)}",
@@ -213,6 +229,8 @@ class PlanCommand(Command):
             )
         except OpenCodeAPIError as e:
             logger.exception("Failed to execute plan command")
+            if e.status_code == 404:
+                bot.forget_room_session(context.room_id)
             return CommandResult(
                 success=False,
                 message=f"Failed to start analysis: {format_opencode_error(e)}",
@@ -342,7 +360,7 @@ class AbortCommand(Command):
 
             statuses = await bot.opencode.get_session_status()
             status = statuses.get(session_id)
-            if status is None or status.status not in {"running", "waiting"}:
+            if status is None or status.status not in ACTIVE_SESSION_STATUSES:
                 return CommandResult(
                     success=False,
                     message=f"Session `{session_id[:8]}...` is not currently running.",
@@ -461,39 +479,31 @@ class HelpCommand(Command):
         if args.strip():
             # Help for specific command
             cmd_name = args.strip().lower()
+            # Aliases are registered as keys of the command table
             cmd = bot.commands.get(cmd_name)
-            if cmd is None:
-                # Check aliases
-                for c in bot.commands.values():
-                    if cmd_name in c.aliases:
-                        cmd = c
-                        break
-
             if cmd is None:
                 return CommandResult(
                     success=False,
                     message=f"Unknown command: {cmd_name}",
                 )
 
-            aliases = f" (aliases: {', '.join(cmd.aliases)})" if cmd.aliases else ""
-            return CommandResult(
-                success=True,
-                message=f"**/{cmd.name}**{aliases}\n\n{cmd.description}\n\nUsage: `{cmd.usage}`",
-            )
+            return CommandResult(success=True, message=cmd.help_text)
 
-        # General help
-        lines = ["**beeperclaw Commands:**\n"]
-        unique_cmds = {cmd.name: cmd for cmd in bot.commands.values()}
-        for name in sorted(unique_cmds):
-            cmd = unique_cmds[name]
-            lines.append(f"• `/{cmd.name}` - {cmd.description}")
+        commands = bot.commands
+        # The shared table is read-only, so its help is rendered once at import
+        text = _COMMAND_TABLE_HELP if commands is COMMAND_TABLE else _render_general_help(commands)
+        return CommandResult(success=True, message=text)
 
-        lines.append("\n\nUse `/help <command>` for more details.")
 
-        return CommandResult(
-            success=True,
-            message="\n".join(lines),
-        )
+def _render_general_help(commands: Mapping[str, Command]) -> str:
+    lines = ["**beeperclaw Commands:**\n"]
+    # Aliases map to the same instance; dedupe by identity in registry order
+    for cmd in dict.fromkeys(commands.values()):
+        lines.append(f"• `/{cmd.name}` - {cmd.description}")
+
+    lines.append("\n\nUse `/help <command>` for more details.")
+
+    return "\n".join(lines)
 
 
 class AgentsCommand(Command):
@@ -552,3 +562,15 @@ ALL_COMMANDS: list[type[Command]] = [
     HelpCommand,
     AgentsCommand,
 ]
+
+# Commands are stateless, so a single shared instance of each backs every bot.
+# Keys are lowercased names and aliases; read-only so it is safe to share.
+COMMAND_TABLE: Mapping[str, Command] = MappingProxyType(
+    {
+        key.lower(): command
+        for command in (cmd_class() for cmd_class in ALL_COMMANDS)
+        for key in (command.name, *command.aliases)
+    }
+)
+# General /help text for the shared table; it cannot change after import
+_COMMAND_TABLE_HELP = _render_general_help(COMMAND_TABLE)
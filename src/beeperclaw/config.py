@@ -2,12 +2,86 @@
 
 from __future__ import annotations
 
+import functools
 import os
+import re
 from pathlib import Path
-from typing import Any
+from types import UnionType
+from typing import Any, TypeVar, Union, get_args, get_origin
 
 import yaml
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter, field_serializer
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+# $NAME or ${NAME}, matching what os.path.expandvars accepts on POSIX
+_ENV_VAR_PATTERN = re.compile(r"\$(?:(\w+)|\{([^}]*)\})")
+# libyaml-backed loader/dumper when PyYAML was built with it, pure Python otherwise
+_YamlLoader: Any = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper: Any = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# Config file names probed during discovery, in order of preference
+_CONFIG_FILE_NAMES = ("config.yaml", "config.yml")
+
+
+def _env_var_value(match: re.Match[str]) -> str:
+    return os.environ.get(match.group(1) or match.group(2), match.group(0))
+
+
+def _nested_model(annotation: Any) -> type[BaseModel] | None:
+    """Return the model class behind a field annotation such as ``Model | None``."""
+    for candidate in (annotation, *get_args(annotation)):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def _accepted_types(annotation: Any) -> tuple[type, ...]:
+    """Return the runtime types a field annotation accepts as-is, e.g. ``(int, NoneType)``."""
+    members = (
+        get_args(annotation) if get_origin(annotation) in (Union, UnionType) else (annotation,)
+    )
+    return tuple(t for member in members if isinstance(t := get_origin(member) or member, type))
+
+
+@functools.cache
+def _adapter(annotation: Any) -> TypeAdapter[Any]:
+    return TypeAdapter(annotation)
+
+
+def _construct(model: type[ModelT], data: dict[str, Any]) -> ModelT:
+    """Build ``model`` from trusted data without validation, recursing into sub-models.
+
+    Values whose type already matches their field are used as-is. Anything else,
+    such as a ``$VAR`` expanded to ``"100"`` for an ``int`` field or a YAML list for
+    a ``frozenset`` field, goes through that field's validator so trusted and
+    validated loads produce identically typed configs.
+    """
+    values = dict(data)
+    for name, field in model.model_fields.items():
+        if name not in values:
+            continue
+        value = values[name]
+        annotation: Any = field.annotation
+        nested = _nested_model(annotation) if isinstance(value, dict) else None
+        if nested is not None:
+            values[name] = _construct(nested, value)
+        elif not isinstance(value, _accepted_types(annotation)):
+            values[name] = _adapter(annotation).validate_python(value)
+    return model.model_construct(**values)
+
+
+def _find_config_file() -> Path | None:
+    """Find the first config file in the current directory, then ~/.config/beeperclaw/.
+
+    Candidates are probed in order and the search stops at the first regular file,
+    so dangling symlinks and directories named like a config file are skipped.
+    """
+    for directory in (Path("."), Path.home() / ".config" / "beeperclaw"):
+        for name in _CONFIG_FILE_NAMES:
+            candidate = directory / name
+            if candidate.is_file():
+                return candidate
+    return None
 
 
 class MatrixConfig(BaseModel):
@@ -17,9 +91,15 @@ class MatrixConfig(BaseModel):
     username: str
     password: str | None = None
     access_token: str | None = None
-    allowed_users: list[str] = Field(default_factory=list)
+    # Validated into a frozenset so per-message allow-list checks are O(1)
+    allowed_users: frozenset[str] = Field(default_factory=frozenset)
     device_name: str = "beeperclaw"
 
+    @field_serializer("allowed_users")
+    def _serialize_allowed_users(self, allowed_users: frozenset[str]) -> list[str]:
+        # Sorted so saved config files are stable across runs
+        return sorted(allowed_users)
+
 
 class OpenCodeAuthConfig(BaseModel):
     """OpenCode basic authentication configuration."""
@@ -64,9 +144,11 @@ class ProvidersConfig(BaseModel):
 
     primary: str = "antigravity"
     fallback: list[str] = Field(default_factory=lambda: ["copilot", "google"])
-    antigravity: AntigravityConfig = Field(default_factory=AntigravityConfig)
-    copilot: CopilotConfig = Field(default_factory=CopilotConfig)
-    google: GoogleConfig = Field(default_factory=GoogleConfig)
+    # Defaults are built with model_construct: they are known-valid, so providers
+    # the config file does not mention skip validation entirely
+    antigravity: AntigravityConfig = Field(default_factory=AntigravityConfig.model_construct)
+    copilot: CopilotConfig = Field(default_factory=CopilotConfig.model_construct)
+    google: GoogleConfig = Field(default_factory=GoogleConfig.model_construct)
 
 
 class GitHubConfig(BaseModel):
@@ -113,12 +195,14 @@ class Config(BaseModel):
     bot: BotConfig = Field(default_factory=BotConfig)
 
     @classmethod
-    def load(cls, path: str | Path | None = None) -> Config:
+    def load(cls, path: str | Path | None = None, *, trusted: bool = False) -> Config:
         """Load configuration from a YAML file.
 
         Args:
             path: Path to the config file. If None, searches for config.yaml
                   in the current directory and ~/.config/beeperclaw/
+            trusted: Skip validation and build the models directly. Only for
+                     files already validated once, e.g. when reloading
 
         Returns:
             Loaded configuration
@@ -128,18 +212,8 @@ class Config(BaseModel):
             ValueError: If the config file is invalid
         """
         if path is None:
-            # Search for config file
-            search_paths = [
-                Path("config.yaml"),
-                Path("config.yml"),
-                Path.home() / ".config" / "beeperclaw" / "config.yaml",
-                Path.home() / ".config" / "beeperclaw" / "config.yml",
-            ]
-            for search_path in search_paths:
-                if search_path.exists():
-                    path = search_path
-                    break
-            else:
+            path = _find_config_file()
+            if path is None:
                 raise FileNotFoundError(
                     "No config file found. Create config.yaml or specify path with --config"
                 )
@@ -149,22 +223,30 @@ class Config(BaseModel):
             raise FileNotFoundError(f"Config file not found: {path}")
 
         with open(path) as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_YamlLoader)
 
         # Expand environment variables in string values
         data = cls._expand_env_vars(data)
 
+        if trusted:
+            return _construct(cls, data)
         return cls.model_validate(data)
 
     @classmethod
     def _expand_env_vars(cls, data: Any) -> Any:
-        """Recursively expand environment variables in config values."""
+        """Expand environment variables in parsed config values, in place.
+
+        Expansion runs after parsing so substituted secrets can never change the
+        YAML structure. Unknown variables are left as-is, like os.path.expandvars.
+        """
         if isinstance(data, dict):
-            return {k: cls._expand_env_vars(v) for k, v in data.items()}
+            for key, value in data.items():
+                data[key] = cls._expand_env_vars(value)
         elif isinstance(data, list):
-            return [cls._expand_env_vars(item) for item in data]
-        elif isinstance(data, str):
-            return os.path.expandvars(data)
+            for index, item in enumerate(data):
+                data[index] = cls._expand_env_vars(item)
+        elif isinstance(data, str) and "$" in data:
+            return _ENV_VAR_PATTERN.sub(_env_var_value, data)
         return data
 
     def save(self, path: str | Path) -> None:
@@ -177,4 +259,6 @@ class Config(BaseModel):
         path.parent.mkdir(parents=True, exist_ok=True)
 
         with open(path, "w") as f:
-            yaml.dump(self.model_dump(), f, default_flow_style=False, sort_keys=False)
+            yaml.dump(
+                self.model_dump(), f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False
+            )
@@ -3,19 +3,113 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import json
 import logging
 import mimetypes
 import random
-from collections.abc import AsyncIterator
+import re
+import time
+from collections.abc import AsyncIterator, Awaitable, Iterable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from typing import Any, Self, TypeVar
 
 import httpx
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# How long agent/command listings are served from cache before a background refresh
+METADATA_TTL_SECONDS = 60.0
+# Upper bound on concurrent requests issued by the batch helpers
+_MAX_CONCURRENT_REQUESTS = 32
+# Many small requests go to the same server; keep connections warm and reusable
+_CONNECTION_LIMITS = httpx.Limits(
+    max_connections=64,
+    max_keepalive_connections=_MAX_CONCURRENT_REQUESTS,
+    keepalive_expiry=60.0,
+)
+# httpx only negotiates HTTP/2 over TLS, and only with the optional h2 package
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+# SSE line terminators, and leading bytes _iter_sse_data inspects in place
+_SSE_LINE_END = re.compile(rb"\r\n|\r|\n")
+_CR = ord("\r")
+_LF = ord("\n")
+_DATA_INITIAL = ord("d")
+
+
+async def _iter_sse_data(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Yield the ``data`` payload of each server-sent event frame as raw bytes.
+
+    Works on the byte stream directly so payloads reach the JSON decoder without
+    a round-trip through ``str``. Lines may end in CRLF, LF or a bare CR, as the
+    SSE spec allows. Multi-line ``data`` fields are joined with newlines and
+    frames without data are skipped.
+    """
+    buffer = bytearray()
+    data_lines: list[bytes] = []
+    # Set when a chunk ended on a bare CR, which may be the first half of a CRLF
+    skip_lf = False
+    async for chunk in chunks:
+        buffer += chunk
+        if not buffer:
+            continue
+        start = 1 if skip_lf and buffer[0] == _LF else 0
+        skip_lf = False
+        while (match := _SSE_LINE_END.search(buffer, start)) is not None:
+            end = match.start()
+            if end == start:
+                if data_lines:
+                    data = b"\n".join(data_lines)
+                    data_lines.clear()
+                    if data:
+                        yield data
+            elif buffer[start] == _DATA_INITIAL:
+                # Only lines that can be "data:" fields are copied out of the buffer;
+                # comments, keepalives and event/id/retry fields are skipped in place
+                line = bytes(buffer[start:end])
+                if line.startswith(b"data:"):
+                    data_lines.append(line[6:] if line[5:6] == b" " else line[5:])
+            start = match.end()
+        # Lines are handled as soon as they end, even on a bare CR, so a frame is
+        # never held back waiting for the next chunk
+        skip_lf = start == len(buffer) and buffer[-1] == _CR
+        del buffer[:start]
+
+    # Flush a final frame that the server closed without a trailing blank line;
+    # whatever is left has no line terminator
+    line = bytes(buffer)
+    if line.startswith(b"data:"):
+        data_lines.append(line[6:] if line[5:6] == b" " else line[5:])
+    if data_lines:
+        data = b"\n".join(data_lines)
+        if data:
+            yield data
+
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _json_loads(data: bytes | str) -> Any:
+    """Decode JSON with orjson when installed, falling back to the stdlib."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data: Any) -> bytes:
+    """Encode JSON with orjson when installed, falling back to the stdlib."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode()
+
 
 class OpenCodeError(Exception):
     """Base OpenCode client error."""
@@ -46,7 +140,7 @@ class OpenCodeInvalidResponseError(OpenCodeError):
     """Raised when OpenCode returns an unexpected payload."""
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Session:
     """Represents an OpenCode session."""
 
@@ -62,7 +156,7 @@ class Session:
     directory: str | None = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Message:
     """Represents a message in a session."""
 
@@ -70,7 +164,7 @@ class Message:
     session_id: str
     role: str
     created_at: str
-    parts: list[dict[str, Any]]
+    parts: tuple[dict[str, Any], ...]
     agent: str | None = None
     model: dict[str, str] | None = None
     parent_id: str | None = None
@@ -87,7 +181,7 @@ class PromptAttachment:
     created_at: float = 0.0
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SessionStatus:
     """Status of a session."""
 
@@ -126,7 +220,11 @@ class OpenCodeClient:
         self.timeout = timeout
         self.max_retries = max_retries
         self.auth = auth
+        self._http2 = self.base_url.startswith("https://") and _HTTP2_AVAILABLE
         self._client: httpx.AsyncClient | None = None
+        self._stream_client: httpx.AsyncClient | None = None
+        self._metadata_cache: dict[str, tuple[float, list[dict[str, Any]]]] = {}
+        self._metadata_refreshes: dict[str, asyncio.Task[None]] = {}
 
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create the HTTP client."""
@@ -135,18 +233,49 @@ class OpenCodeClient:
                 base_url=self.base_url,
                 timeout=self.timeout,
                 auth=self.auth,
+                http2=self._http2,
+                limits=_CONNECTION_LIMITS,
             )
         return self._client
 
+    async def _get_stream_client(self) -> httpx.AsyncClient:
+        """Get the client for the SSE event stream, which always stays on HTTP/1.1.
+
+        A long-lived event stream is kept off the multiplexed HTTP/2 connection so
+        server or proxy stream limits cannot stall it or the regular requests.
+        Without HTTP/2 the regular client already speaks HTTP/1.1 and is reused.
+        """
+        if not self._http2:
+            return await self._get_client()
+        if self._stream_client is None or self._stream_client.is_closed:
+            self._stream_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                auth=self.auth,
+                http2=False,
+            )
+        return self._stream_client
+
     async def close(self) -> None:
         """Close the HTTP client."""
+        for task in list(self._metadata_refreshes.values()):
+            task.cancel()
         if self._client is not None:
             await self._client.aclose()
             self._client = None
+        if self._stream_client is not None:
+            await self._stream_client.aclose()
+            self._stream_client = None
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.close()
 
     def _safe_json(self, response: httpx.Response) -> Any | None:
         try:
-            return response.json()
+            return _json_loads(response.content)
         except Exception:
             return None
 
@@ -192,6 +321,9 @@ class OpenCodeClient:
         client = await self._get_client()
         retries = self.max_retries if max_retries is None else max_retries
         delay = 1.0
+        # Serialize once up front rather than letting httpx re-encode on every retry
+        content = _json_dumps(json_body) if json_body is not None else None
+        headers = _JSON_HEADERS if content is not None else None
 
         for attempt in range(1, retries + 2):
             try:
@@ -199,14 +331,19 @@ class OpenCodeClient:
                     method,
                     path,
                     params=params,
-                    json=json_body,
+                    content=content,
+                    headers=headers,
                     timeout=timeout or self.timeout,
                 )
             except (httpx.TimeoutException, httpx.TransportError) as exc:
                 if attempt <= retries:
                     sleep_for = delay + random.uniform(0, 0.5)
                     logger.warning(
-                        f"OpenCode request {method} {path} failed ({exc}), retrying in {sleep_for:.2f}s"
+                        "OpenCode request %s %s failed (%s), retrying in %.2fs",
+                        method,
+                        path,
+                        exc,
+                        sleep_for,
                     )
                     await asyncio.sleep(sleep_for)
                     delay = min(delay * 2, 30.0)
@@ -228,7 +365,10 @@ class OpenCodeClient:
                         sleep_for = retry_after if retry_after is not None else delay
                         sleep_for += random.uniform(0, 0.5)
                         logger.warning(
-                            f"OpenCode rate limited on {method} {path}, retrying in {sleep_for:.2f}s"
+                            "OpenCode rate limited on %s %s, retrying in %.2fs",
+                            method,
+                            path,
+                            sleep_for,
                         )
                         await asyncio.sleep(sleep_for)
                         delay = min(delay * 2, 30.0)
@@ -244,8 +384,11 @@ class OpenCodeClient:
                     sleep_for = retry_after if retry_after is not None else delay
                     sleep_for += random.uniform(0, 0.5)
                     logger.warning(
-                        f"OpenCode server error {response.status_code} on {method} {path}, "
-                        f"retrying in {sleep_for:.2f}s"
+                        "OpenCode server error %s on %s %s, retrying in %.2fs",
+                        response.status_code,
+                        method,
+                        path,
+                        sleep_for,
                     )
                     await asyncio.sleep(sleep_for)
                     delay = min(delay * 2, 30.0)
@@ -263,8 +406,11 @@ class OpenCodeClient:
 
         raise OpenCodeAPIError(f"OpenCode request failed after retries for {method} {path}")
 
-    def _extract_time(self, payload: dict[str, Any], key: str) -> str:
-        time_block = payload.get("time") or {}
+    def _extract_time(
+        self, payload: dict[str, Any], key: str, time_block: Any | None = None
+    ) -> str:
+        if time_block is None:
+            time_block = payload.get("time")
         value = None
         if isinstance(time_block, dict):
             value = time_block.get(key)
@@ -282,13 +428,15 @@ class OpenCodeClient:
         return payload[field]
 
     def _parse_session(self, payload: dict[str, Any]) -> Session:
+        """Build a Session from any session payload (list, get and create share it)."""
         session_id = self._require_field(payload, "id", "session")
+        time_block = payload.get("time")
         return Session(
             id=session_id,
             title=payload.get("title"),
             parent_id=payload.get("parentID") or payload.get("parentId"),
-            created_at=self._extract_time(payload, "created"),
-            updated_at=self._extract_time(payload, "updated"),
+            created_at=self._extract_time(payload, "created", time_block),
+            updated_at=self._extract_time(payload, "updated", time_block),
             share=payload.get("share"),
             slug=payload.get("slug"),
             version=payload.get("version"),
@@ -318,17 +466,17 @@ class OpenCodeClient:
             role = nested_message.get("role")
         if not role:
             raise OpenCodeInvalidResponseError("Missing 'role' in message.info payload")
-        parts: list[dict[str, Any]] = []
+        parts: tuple[dict[str, Any], ...] = ()
         payload_parts = payload.get("parts")
         if isinstance(payload_parts, list):
-            parts = [p for p in payload_parts if isinstance(p, dict)]
+            parts = tuple(p for p in payload_parts if isinstance(p, dict))
         info_parts = info.get("parts")
         if not parts and isinstance(info_parts, list):
-            parts = [p for p in info_parts if isinstance(p, dict)]
+            parts = tuple(p for p in info_parts if isinstance(p, dict))
         if not parts:
             fallback_parts = nested_message.get("parts")
             if isinstance(fallback_parts, list):
-                parts = [p for p in fallback_parts if isinstance(p, dict)]
+                parts = tuple(p for p in fallback_parts if isinstance(p, dict))
         return Message(
             id=message_id,
             session_id=session_id,
@@ -363,7 +511,8 @@ class OpenCodeClient:
 
     def extract_session_id_from_event(self, event: OpenCodeEvent) -> str | None:
         """Best-effort session id extraction from an event."""
-        session_id = event.properties.get("sessionID") or event.properties.get("sessionId")
+        properties = event.properties
+        session_id = properties.get("sessionID") or properties.get("sessionId")
         if isinstance(session_id, str):
             return session_id
 
@@ -555,15 +704,55 @@ class OpenCodeClient:
         Returns:
             List of messages
         """
-        params = {}
-        if limit:
-            params["limit"] = limit
+        params = {"limit": limit} if limit else None
         response = await self._request("GET", f"/session/{session_id}/message", params=params)
         data = self._expect_json(response, "get messages")
         if not isinstance(data, list):
             raise OpenCodeInvalidResponseError("Expected list for messages response")
         return [self._parse_message(m) for m in data if isinstance(m, dict)]
 
+    async def get_many_sessions(self, session_ids: list[str]) -> dict[str, Session]:
+        """Get details for several sessions concurrently.
+
+        Args:
+            session_ids: Session IDs
+
+        Returns:
+            Dictionary mapping session ID to session details
+        """
+        sessions = await self._fan_out(self.get_session(session_id) for session_id in session_ids)
+        return dict(zip(session_ids, sessions, strict=True))
+
+    async def get_many_messages(
+        self,
+        session_ids: list[str],
+        limit: int | None = None,
+    ) -> dict[str, list[Message]]:
+        """Get messages for several sessions concurrently.
+
+        Args:
+            session_ids: Session IDs
+            limit: Maximum number of messages to return per session
+
+        Returns:
+            Dictionary mapping session ID to its messages
+        """
+        messages = await self._fan_out(
+            self.get_messages(session_id, limit=limit) for session_id in session_ids
+        )
+        return dict(zip(session_ids, messages, strict=True))
+
+    async def _fan_out(self, requests: Iterable[Awaitable[T]]) -> list[T]:
+        # Cap in-flight requests at the pool's keep-alive size so a large batch
+        # reuses warm connections instead of opening new ones
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+        async def bounded(request: Awaitable[T]) -> T:
+            async with semaphore:
+                return await request
+
+        return await asyncio.gather(*(bounded(request) for request in requests))
+
     async def send_message(
         self,
         session_id: str,
@@ -662,7 +851,7 @@ class OpenCodeClient:
                 max_retries=1,
             )
         except OpenCodeAPIError as exc:
-            logger.warning(f"Error sending async message: {exc}")
+            logger.warning("Error sending async message: %s", exc)
             raise
 
     async def execute_command(
@@ -708,34 +897,64 @@ class OpenCodeClient:
     async def list_agents(self) -> list[dict[str, Any]]:
         """List available agents.
 
+        Results are cached; see ``_cached_list``.
+
         Returns:
             List of agent definitions
         """
-        response = await self._request("GET", "/agent")
-        payload = self._expect_json(response, "list agents")
-        if not isinstance(payload, list):
-            raise OpenCodeInvalidResponseError("Expected list for agents response")
-        return payload
+        return await self._cached_list("/agent", "agents")
 
     async def list_commands(self) -> list[dict[str, Any]]:
         """List available commands.
 
+        Results are cached; see ``_cached_list``.
+
         Returns:
             List of command definitions
         """
-        response = await self._request("GET", "/command")
-        payload = self._expect_json(response, "list commands")
+        return await self._cached_list("/command", "commands")
+
+    async def _cached_list(self, path: str, context: str) -> list[dict[str, Any]]:
+        """Serve near-static server metadata with stale-while-revalidate caching.
+
+        Fresh entries are returned directly. Stale entries are returned immediately
+        while a background task refreshes them; a failed refresh keeps the old value.
+        """
+        cached = self._metadata_cache.get(path)
+        if cached is None:
+            return await self._fetch_list(path, context)
+
+        fetched_at, payload = cached
+        if (
+            time.monotonic() - fetched_at >= METADATA_TTL_SECONDS
+            and path not in self._metadata_refreshes
+        ):
+            task = asyncio.create_task(self._refresh_list(path, context))
+            self._metadata_refreshes[path] = task
+            task.add_done_callback(lambda _: self._metadata_refreshes.pop(path, None))
+        return payload
+
+    async def _fetch_list(self, path: str, context: str) -> list[dict[str, Any]]:
+        response = await self._request("GET", path)
+        payload = self._expect_json(response, f"list {context}")
         if not isinstance(payload, list):
-            raise OpenCodeInvalidResponseError("Expected list for commands response")
+            raise OpenCodeInvalidResponseError(f"Expected list for {context} response")
+        self._metadata_cache[path] = (time.monotonic(), payload)
         return payload
 
+    async def _refresh_list(self, path: str, context: str) -> None:
+        try:
+            await self._fetch_list(path, context)
+        except Exception as exc:
+            logger.warning("Failed to refresh OpenCode %s, serving cached copy: %s", context, exc)
+
     async def subscribe_events(self) -> AsyncIterator[OpenCodeEvent]:
         """Subscribe to server-sent events.
 
         Yields:
             Normalized event payloads
         """
-        client = await self._get_client()
+        client = await self._get_stream_client()
         delay = 1.0
         path = "/global/event"
         fallback_used = False
@@ -748,24 +967,22 @@ class OpenCodeClient:
                         fallback_used = True
                         continue
                     response.raise_for_status()
-                    async for line in response.aiter_lines():
-                        if line.startswith("data: "):
-                            data = line[6:]
-                            if data:
-                                try:
-                                    payload = json.loads(data)
-                                    if not isinstance(payload, dict):
-                                        logger.warning(f"Unexpected non-dict event payload: {payload}")
-                                        continue
-                                    yield self.normalize_event(payload)
-                                except json.JSONDecodeError:
-                                    logger.warning(f"Failed to parse event: {data}")
+                    async for data in _iter_sse_data(response.aiter_bytes()):
+                        try:
+                            payload = _json_loads(data)
+                        except json.JSONDecodeError:
+                            logger.warning("Failed to parse event: %r", data)
+                            continue
+                        if not isinstance(payload, dict):
+                            logger.warning("Unexpected non-dict event payload: %s", payload)
+                            continue
+                        yield self.normalize_event(payload)
                 delay = 1.0
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
                 sleep_for = delay + random.uniform(0, 0.5)
-                logger.warning(f"Event stream error: {exc}. Reconnecting in {sleep_for:.2f}s")
+                logger.warning("Event stream error: %s. Reconnecting in %.2fs", exc, sleep_for)
                 await asyncio.sleep(sleep_for)
                 delay = min(delay * 2, 30.0)
 
@@ -781,9 +998,7 @@ class OpenCodeClient:
         Returns:
             List of file diffs
         """
-        params = {}
-        if message_id:
-            params["messageID"] = message_id
+        params = {"messageID": message_id} if message_id else None
         response = await self._request("GET", f"/session/{session_id}/diff", params=params)
         payload = self._expect_json(response, "get diff")
         if not isinstance(payload, list):
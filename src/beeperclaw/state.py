@@ -74,7 +74,7 @@ class StateStore:
                 last_bootstrap_attempt=data.get("last_bootstrap_attempt"),
             )
         except Exception as exc:
-            logger.warning(f"Failed to load state from {self.path}: {exc}")
+            logger.warning("Failed to load state from %s: %s", self.path, exc)
             return BotState()
 
     def save(self, state: BotState) -> None:
@@ -88,7 +88,7 @@ class StateStore:
                 handle.write("\n")
             tmp_path.replace(self.path)
         except Exception as exc:
-            logger.warning(f"Failed to save state to {self.path}: {exc}")
+            logger.warning("Failed to save state to %s: %s", self.path, exc)
             if tmp_path.exists():
                 try:
                     tmp_path.unlink()
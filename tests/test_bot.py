@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from nio.responses import DiskDownloadResponse, DownloadError
@@ -20,7 +21,7 @@ from beeperclaw.commands import (
     StatusCommand,
 )
 from beeperclaw.config import Config
-from beeperclaw.opencode_client import Session, SessionStatus
+from beeperclaw.opencode_client import OpenCodeAPIError, Session, SessionStatus
 
 
 @dataclass
@@ -32,6 +33,7 @@ class _SentMessage:
 
 class _DummyAsyncClient:
     def __init__(self) -> None:
+        self.user_id = ""
         self.sent_messages: list[_SentMessage] = []
         self.download = AsyncMock(side_effect=self._download_impl)
 
@@ -137,9 +139,11 @@ def _room(room_id: str = "!room:example.org") -> SimpleNamespace:
     return SimpleNamespace(room_id=room_id)
 
 
-def _text_event(body: str, *, event_id: str = "$text") -> SimpleNamespace:
+def _text_event(
+    body: str, *, event_id: str = "$text", sender: str = "@mihai:matrix.org"
+) -> SimpleNamespace:
     return SimpleNamespace(
-        sender="@mihai:matrix.org",
+        sender=sender,
         body=body,
         event_id=event_id,
         source={"event_id": event_id, "content": {"body": body}},
@@ -215,6 +219,40 @@ async def test_long_running_commands_reject_busy_room(bot_factory, command_cls)
     assert "Wait for it to finish" in result.message
 
 
+@pytest.mark.asyncio
+@pytest.mark.parametrize("command_cls", [BuildCommand, PlanCommand])
+async def test_long_running_command_drops_session_missing_on_server(
+    bot_factory, command_cls
+) -> None:
+    bot = bot_factory()
+    bot._room_sessions["!room:example.org"] = "sess-1"
+    bot.opencode.get_session = AsyncMock(return_value=_session("sess-1"))
+    bot.opencode.get_session_status = AsyncMock(return_value={})
+    bot.opencode.create_session = AsyncMock(return_value=_session("sess-2"))
+    bot.opencode.send_message_async = AsyncMock(
+        side_effect=[OpenCodeAPIError("Session not found", status_code=404), None]
+    )
+    context = CommandContext(
+        room_id="!room:example.org",
+        sender="@mihai:matrix.org",
+        event_id="$event",
+    )
+
+    # Verify (and cache) the mapped session before OpenCode loses it
+    await bot.get_or_create_session_for_room("!room:example.org")
+    failed = await command_cls().execute(bot, "do the thing", context)
+
+    assert failed.success is False
+    assert bot.get_room_session_id("!room:example.org") is None
+
+    retried = await command_cls().execute(bot, "do the thing", context)
+
+    assert retried.success is True
+    bot.opencode.create_session.assert_awaited_once()
+    assert bot.get_room_session_id("!room:example.org") == "sess-2"
+    assert bot.opencode.send_message_async.await_args.kwargs["session_id"] == "sess-2"
+
+
 @pytest.mark.asyncio
 async def test_status_defaults_to_current_room_session(bot_factory) -> None:
     bot = bot_factory()
@@ -401,3 +439,226 @@ async def test_attachment_download_failure_returns_helpful_reply(bot_factory) ->
     assert len(sent_messages) == 1
     assert "Couldn't use that attachment" in sent_messages[0].content["body"]
     assert bot._staged_attachments_for_room("!room:example.org") == ()
+
+
+def test_is_user_allowed_uses_configured_allow_list(bot_factory) -> None:
+    bot = bot_factory()
+
+    assert bot.is_user_allowed("@mihai:matrix.org") is True
+    assert bot.is_user_allowed("@stranger:matrix.org") is False
+
+    bot.config.matrix.allowed_users = []
+    unrestricted = BeeperClawBot(bot.config)
+    assert unrestricted.is_user_allowed("@stranger:matrix.org") is True
+
+
+@pytest.mark.asyncio
+async def test_messages_from_bot_itself_are_ignored(bot_factory) -> None:
+    bot = bot_factory()
+    bot._execute_command = AsyncMock()  # type: ignore[method-assign]
+    event = _text_event("/help")
+    event.sender = "@beeperclaw:test"
+
+    await bot.handle_message(_room(), event)
+
+    bot._execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_room_session_verification_is_cached(bot_factory, monkeypatch) -> None:
+    bot = bot_factory()
+    bot._room_sessions["!room:example.org"] = "sess-1"
+    bot.opencode.get_session = AsyncMock(return_value=_session("sess-1"))
+    clock = [100.0]
+    monkeypatch.setattr(bot_module.time, "monotonic", lambda: clock[0])
+
+    await bot.get_or_create_session_for_room("!room:example.org")
+    await bot.get_or_create_session_for_room("!room:example.org")
+    assert bot.opencode.get_session.await_count == 1
+
+    clock[0] += bot_module.SESSION_VERIFY_TTL_SECONDS
+    await bot.get_or_create_session_for_room("!room:example.org")
+    assert bot.opencode.get_session.await_count == 2
+
+
+@pytest.mark.asyncio
+async def test_long_results_are_split_with_reply_on_first_part(bot_factory) -> None:
+    bot = bot_factory()
+    bot.config.bot.max_message_length = 10
+
+    await bot._send_result(
+        "!room:example.org",
+        bot_module.CommandResult(success=True, message="x" * 25),
+        reply_to_event_id="$origin",
+    )
+
+    sent_messages = bot.bot.api.async_client.sent_messages
+    assert [len(message.content["body"]) for message in sent_messages] == [10, 10, 5]
+    assert sent_messages[0].content["m.relates_to"]["m.in_reply_to"]["event_id"] == "$origin"
+    assert all("m.relates_to" not in message.content for message in sent_messages[1:])
+
+
+@pytest.mark.asyncio
+async def test_long_result_parts_keep_order_when_sends_are_slow(bot_factory) -> None:
+    bot = bot_factory()
+    bot.config.bot.max_message_length = 1
+    async_client = bot.bot.api.async_client
+    record_send = async_client.room_send
+    delays = iter([0.03, 0.02, 0.01, 0.0])
+
+    async def slow_room_send(**kwargs):
+        # Earlier parts take longer, so overlapping sends would land out of order
+        await asyncio.sleep(next(delays))
+        return await record_send(**kwargs)
+
+    async_client.room_send = slow_room_send
+
+    await bot._send_result("!room:example.org", bot_module.CommandResult(True, "abcd"))
+
+    assert [message.content["body"] for message in async_client.sent_messages] == list("abcd")
+
+
+@pytest.mark.asyncio
+async def test_monitor_skips_event_parsing_without_pending_runs(bot_factory) -> None:
+    bot = bot_factory()
+    bot.opencode.extract_session_id_from_event = Mock()  # type: ignore[method-assign]
+
+    async def fake_events():
+        yield _assistant_event(bot)
+
+    bot.opencode.subscribe_events = fake_events  # type: ignore[method-assign]
+
+    await bot._monitor_events()
+
+    bot.opencode.extract_session_id_from_event.assert_not_called()
+    assert bot.bot.api.async_client.sent_messages == []
+
+
+@pytest.mark.asyncio
+async def test_event_queue_drops_oldest_when_full(bot_factory, caplog) -> None:
+    bot = bot_factory()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    items = [("sess-1", _assistant_event(bot, message_id=f"msg-{index}")) for index in range(5)]
+
+    with caplog.at_level("WARNING", logger=bot_module.logger.name):
+        for item in items:
+            bot._enqueue_event(queue, item)
+
+    assert [queue.get_nowait(), queue.get_nowait()] == items[3:]
+    # Three drops, but only the first one is logged within the warning interval
+    assert len([r for r in caplog.records if "queue full" in r.getMessage()]) == 1
+    assert bot._dropped_events == 2
+
+
+@pytest.mark.asyncio
+async def test_monitor_only_queues_events_for_pending_sessions(bot_factory) -> None:
+    bot = bot_factory()
+    bot.register_pending_run(
+        session_id="sess-1",
+        room_id="!room:example.org",
+        sender="@mihai:matrix.org",
+        command_name="build",
+        origin_event_id="$origin",
+        state="running",
+    )
+    bot.opencode.get_session_status = AsyncMock(return_value={})  # type: ignore[method-assign]
+    queued: list = []
+    enqueue_event = bot._enqueue_event
+
+    def record_enqueue(queue, item):
+        queued.append(item)
+        enqueue_event(queue, item)
+
+    bot._enqueue_event = record_enqueue  # type: ignore[method-assign]
+
+    async def fake_events():
+        for _ in range(3):
+            yield _assistant_event(bot, session_id="sess-other")
+        yield _assistant_event(bot)
+
+    bot.opencode.subscribe_events = fake_events  # type: ignore[method-assign]
+
+    await bot._monitor_events()
+
+    assert [item[0] for item in queued if item is not None] == ["sess-1"]
+    assert len(bot.bot.api.async_client.sent_messages) == 1
+
+
+@pytest.mark.asyncio
+async def test_plain_chat_skips_dedup_and_command_dispatch(bot_factory) -> None:
+    bot = bot_factory()
+    bot._execute_command = AsyncMock()  # type: ignore[method-assign]
+
+    await bot.handle_message(_room(), _text_event("just chatting", event_id="$chat"))
+
+    assert "$chat" not in bot._seen_event_ids_set
+    bot._execute_command.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bootstrap_shell_room_sets_alias_and_invites_allowed_users(bot_factory) -> None:
+    bot = bot_factory()
+    async_client = bot.bot.api.async_client
+    async_client.room_resolve_alias = AsyncMock(return_value=object())
+    async_client.room_create = AsyncMock(return_value=SimpleNamespace(room_id="!shell:test"))
+    async_client.room_put_alias = AsyncMock(return_value=object())
+    async_client.room_invite = AsyncMock(return_value=object())
+
+    await bot._bootstrap_shell_room()
+
+    async_client.room_put_alias.assert_awaited_once_with(
+        room_alias="#beeperclaw-shell:test", room_id="!shell:test"
+    )
+    async_client.room_invite.assert_awaited_once_with(
+        room_id="!shell:test", user_id="@mihai:matrix.org"
+    )
+    assert bot._shell_room_id == "!shell:test"
+
+
+@pytest.mark.asyncio
+async def test_start_cancels_login_when_opencode_is_unreachable(bot_factory) -> None:
+    bot = bot_factory()
+    bot.opencode.health_check = AsyncMock(side_effect=RuntimeError("down"))  # type: ignore[method-assign]
+    login_cancelled = asyncio.Event()
+
+    async def slow_login():
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            login_cancelled.set()
+            raise
+
+    bot.bot.api.login = slow_login
+
+    with pytest.raises(RuntimeError, match="down"):
+        await bot.start()
+
+    assert login_cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_start_uses_server_reported_user_id_for_self_messages(bot_factory) -> None:
+    bot = bot_factory()
+    bot.opencode.health_check = AsyncMock(return_value={"version": "1"})  # type: ignore[method-assign]
+    async_client = bot.bot.api.async_client
+    async_client.sync_forever = AsyncMock()
+    bot._bootstrap_shell_room = AsyncMock()  # type: ignore[method-assign]
+
+    async def login():
+        async_client.user_id = "@beeperclaw:matrix.example.org"
+
+    async def no_events():
+        return
+        yield
+
+    bot.bot.api.login = login
+    bot.opencode.subscribe_events = no_events  # type: ignore[method-assign]
+
+    await bot.start()
+    await bot.stop()
+
+    bot._execute_command = AsyncMock()  # type: ignore[method-assign]
+    await bot.handle_message(
+        _room(), _text_event("/help", sender="@beeperclaw:matrix.example.org", event_id="$self")
+    )
+    bot._execute_command.assert_not_awaited()
@@ -4,7 +4,7 @@ from types import SimpleNamespace
 
 import pytest
 
-from beeperclaw.commands import CommandContext, HelpCommand, SSHCommand
+from beeperclaw.commands import COMMAND_TABLE, CommandContext, HelpCommand, SSHCommand
 from beeperclaw.config import Config
 
 
@@ -96,3 +96,33 @@ async def test_help_resolves_alias_to_primary_command() -> None:
 
     assert result.success is True
     assert result.message.startswith("**/ssh**")
+
+
+@pytest.mark.asyncio
+async def test_general_help_for_shared_table_is_rendered_once() -> None:
+    """The shared command table's help should be served without re-rendering."""
+    help_command = COMMAND_TABLE["help"]
+    bot = SimpleNamespace(config=make_config(), commands=COMMAND_TABLE)
+
+    first = await help_command.execute(bot, "", TEST_CONTEXT)
+    second = await help_command.execute(bot, "", TEST_CONTEXT)
+
+    assert second.message is first.message
+    assert "`/help`" in first.message
+
+
+@pytest.mark.asyncio
+async def test_general_help_reflects_custom_table_changes() -> None:
+    """Help for other tables should always match their current commands."""
+    ssh = SSHCommand()
+    help_command = HelpCommand()
+    commands = {"ssh": ssh, "mosh": ssh}
+    bot = SimpleNamespace(config=make_config(), commands=commands)
+
+    await help_command.execute(bot, "", TEST_CONTEXT)
+    replacement = SSHCommand()
+    replacement.description = "Replacement SSH helper"
+    commands["ssh"] = commands["mosh"] = replacement
+    result = await help_command.execute(bot, "", TEST_CONTEXT)
+
+    assert "Replacement SSH helper" in result.message
@@ -1,5 +1,8 @@
 """Tests for configuration defaults."""
 
+import pytest
+import yaml
+
 from beeperclaw.config import Config
 
 
@@ -10,3 +13,118 @@ def test_bot_connect_settings_default_to_safe_values() -> None:
     assert config.bot.connect_host is None
     assert config.bot.connect_user is None
     assert config.bot.connect_ssh_port == 22
+
+
+def test_trusted_load_matches_validated_load(tmp_path) -> None:
+    """Trusted loads should build the same nested models without validation."""
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "matrix:\n"
+        "  username: '@beeperclaw-bot:matrix.org'\n"
+        "  allowed_users: ['@mihai:matrix.org']\n"
+        "opencode:\n"
+        "  auth:\n"
+        "    username: opencode\n"
+        "providers:\n"
+        "  google:\n"
+        "    api_key: key\n"
+    )
+
+    validated = Config.load(path)
+    trusted = Config.load(path, trusted=True)
+
+    assert trusted == validated
+    assert trusted.matrix.allowed_users == frozenset({"@mihai:matrix.org"})
+    assert trusted.opencode.auth is not None and trusted.opencode.auth.username == "opencode"
+    assert trusted.providers.google.api_key == "key"
+    assert trusted.providers.copilot.default_model == validated.providers.copilot.default_model
+
+
+def test_trusted_load_coerces_env_substituted_scalars(tmp_path, monkeypatch) -> None:
+    """Expanded env vars should get the field's type on trusted loads too."""
+    monkeypatch.setenv("BEEPERCLAW_TEST_MAXLEN", "100")
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "matrix:\n"
+        "  username: '@beeperclaw-bot:matrix.org'\n"
+        "bot:\n"
+        "  max_message_length: ${BEEPERCLAW_TEST_MAXLEN}\n"
+    )
+
+    trusted = Config.load(path, trusted=True)
+
+    assert trusted.bot.max_message_length == 100
+    assert trusted == Config.load(path)
+
+
+def test_env_vars_expand_without_changing_yaml_structure(tmp_path, monkeypatch) -> None:
+    """Expanded secrets should stay scalar values even if they contain YAML syntax."""
+    monkeypatch.setenv("BEEPERCLAW_TEST_PASSWORD", "secret #1: not-a-key")
+    monkeypatch.delenv("BEEPERCLAW_TEST_UNSET", raising=False)
+    path = tmp_path / "config.yaml"
+    path.write_text(
+        "matrix:\n"
+        "  username: '@beeperclaw-bot:matrix.org'\n"
+        "  password: ${BEEPERCLAW_TEST_PASSWORD}\n"
+        "  access_token: $BEEPERCLAW_TEST_UNSET\n"
+    )
+
+    config = Config.load(path)
+
+    assert config.matrix.password == "secret #1: not-a-key"
+    assert config.matrix.access_token == "$BEEPERCLAW_TEST_UNSET"
+
+
+def test_load_discovers_config_yml_in_working_directory(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "config.yml").write_text("matrix:\n  username: '@yml:example.org'\n")
+
+    assert Config.load().matrix.username == "@yml:example.org"
+
+    (tmp_path / "config.yaml").write_text("matrix:\n  username: '@yaml:example.org'\n")
+    assert Config.load().matrix.username == "@yaml:example.org"
+
+
+def test_load_skips_dangling_config_symlink(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+    (tmp_path / "config.yaml").symlink_to(tmp_path / "missing.yaml")
+    home_config = tmp_path / "home" / ".config" / "beeperclaw" / "config.yaml"
+    home_config.parent.mkdir(parents=True)
+    home_config.write_text("matrix:\n  username: '@home:example.org'\n")
+
+    assert Config.load().matrix.username == "@home:example.org"
+
+
+def test_load_without_config_file_raises(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("HOME", str(tmp_path / "home"))
+
+    with pytest.raises(FileNotFoundError):
+        Config.load()
+
+
+def test_unmentioned_providers_get_default_settings(tmp_path) -> None:
+    config = Config.model_validate(
+        {"matrix": {"username": "@bot:example.org"}, "providers": {"google": {"api_key": "key"}}}
+    )
+    path = tmp_path / "config.yaml"
+
+    config.save(path)
+
+    saved = yaml.safe_load(path.read_text())["providers"]
+    assert saved["copilot"] == {"default_model": "claude-opus-4.5"}
+    assert saved["antigravity"]["base_url"] == "http://127.0.0.1:8045/v1"
+    assert saved["google"]["api_key"] == "key"
+
+
+def test_save_round_trips(tmp_path) -> None:
+    config = Config.model_validate(
+        {"matrix": {"username": "@bot:example.org", "allowed_users": ["@me:example.org"]}}
+    )
+    path = tmp_path / "nested" / "config.yaml"
+
+    config.save(path)
+
+    assert Config.load(path) == config
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 from collections.abc import AsyncIterator
 from unittest.mock import AsyncMock
@@ -14,6 +15,7 @@ from beeperclaw.opencode_client import (
     OpenCodeClient,
     OpenCodeInvalidResponseError,
     PromptAttachment,
+    _iter_sse_data,
 )
 
 
@@ -54,9 +56,12 @@ class _FakeStreamResponse:
             response = httpx.Response(self.status_code, request=request)
             raise httpx.HTTPStatusError("boom", request=request, response=response)
 
-    async def aiter_lines(self) -> AsyncIterator[str]:
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        # Split each frame across two chunks to exercise buffering
         for line in self._lines:
-            yield line
+            frame = f"{line}\n\n".encode()
+            yield frame[:10]
+            yield frame[10:]
 
 
 class _FakeHttpClient:
@@ -221,7 +226,7 @@ class TestOpenCodeClient:
             attachments=[attachment],
         )
 
-        body = fake_client.requests[0]["json"]
+        body = json.loads(fake_client.requests[0]["content"])
         assert isinstance(body, dict)
         parts = body["parts"]
         assert parts[0]["type"] == "text"
@@ -230,3 +235,146 @@ class TestOpenCodeClient:
         assert parts[1]["type"] == "file"
         assert parts[1]["filename"] == "error.png"
         assert parts[1]["url"] == attachment_path.resolve().as_uri()
+
+    def test_parse_session_reads_time_block_and_legacy_keys(self, client: OpenCodeClient) -> None:
+        documented = client._parse_session(
+            {"id": "sess-1", "parentID": "sess-0", "time": {"created": 1, "updated": 2}}
+        )
+        legacy = client._parse_session(
+            {"id": "sess-2", "parentId": "sess-0", "createdAt": "a", "updated_at": "b"}
+        )
+
+        assert (documented.created_at, documented.updated_at) == ("1", "2")
+        assert (legacy.created_at, legacy.updated_at) == ("a", "b")
+        assert documented.parent_id == legacy.parent_id == "sess-0"
+
+
+async def _chunks(*chunks: bytes) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_splits_frames_across_chunks() -> None:
+    stream = _chunks(
+        b': keepalive\r\n\r\nevent: message\r\ndata: {"a"',
+        b": 1}\r\n\r\ndata:[1,\ndata: 2]\n\n",
+        b"data: {}",
+    )
+
+    frames = [frame async for frame in _iter_sse_data(stream)]
+
+    assert frames == [b'{"a": 1}', b"[1,\n2]", b"{}"]
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_accepts_bare_cr_line_endings() -> None:
+    stream = _chunks(b"data: 1\r\rdata: 2\r", b"\ndata: 3\r", b"\r: ping\r\r", b"data: 4\r")
+
+    frames = [frame async for frame in _iter_sse_data(stream)]
+
+    assert frames == [b"1", b"2\n3", b"4"]
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_yields_crlf_frame_ending_on_chunk_boundary() -> None:
+    more = asyncio.Event()
+
+    async def stream():
+        yield b'data: {"a":1}\r\n\r\n'
+        # The server goes idle; the frame must not wait for another chunk
+        await more.wait()
+
+    frames = _iter_sse_data(stream())
+
+    assert await asyncio.wait_for(anext(frames), timeout=0.5) == b'{"a":1}'
+    more.set()
+    assert [frame async for frame in frames] == []
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_strips_crlf_at_end_of_stream() -> None:
+    frames = [frame async for frame in _iter_sse_data(_chunks(b"data: 1\r\n"))]
+
+    assert frames == [b"1"]
+
+
+@pytest.mark.asyncio
+async def test_iter_sse_data_ignores_non_data_fields() -> None:
+    stream = _chunks(b":\n\nid: 7\nretry: 10\ndone: 1\ndata: 1\n\n\r\n\r\nevent: x\n\n")
+
+    frames = [frame async for frame in _iter_sse_data(stream)]
+
+    assert frames == [b"1"]
+
+
+@pytest.mark.asyncio
+async def test_get_many_messages_maps_results_by_session(client: OpenCodeClient) -> None:
+    async def fake_get_messages(session_id: str, limit: int | None = None) -> list[Message]:
+        return [
+            Message(
+                id=f"{session_id}-msg", session_id=session_id, role="user", created_at="", parts=()
+            )
+        ]
+
+    client.get_messages = fake_get_messages  # type: ignore[method-assign]
+
+    result = await client.get_many_messages(["sess-1", "sess-2"], limit=5)
+
+    assert list(result) == ["sess-1", "sess-2"]
+    assert result["sess-2"][0].id == "sess-2-msg"
+
+
+@pytest.mark.asyncio
+async def test_list_agents_serves_stale_cache_while_refreshing(
+    client: OpenCodeClient, monkeypatch
+) -> None:
+    request = httpx.Request("GET", "http://127.0.0.1:4096/agent")
+    fake_client = _RetryingHttpClient(
+        [
+            httpx.Response(200, request=request, json=[{"name": "build"}]),
+            httpx.Response(200, request=request, json=[{"name": "plan"}]),
+        ]
+    )
+    client._get_client = AsyncMock(return_value=fake_client)  # type: ignore[attr-defined]
+    clock = [100.0]
+    monkeypatch.setattr("beeperclaw.opencode_client.time.monotonic", lambda: clock[0])
+
+    assert await client.list_agents() == [{"name": "build"}]
+    assert await client.list_agents() == [{"name": "build"}]
+    assert fake_client.calls == 1
+
+    clock[0] += 61.0
+    assert await client.list_agents() == [{"name": "build"}]
+    await asyncio.gather(*client._metadata_refreshes.values())
+
+    assert fake_client.calls == 2
+    assert await client.list_agents() == [{"name": "plan"}]
+
+
+@pytest.mark.asyncio
+async def test_async_context_manager_closes_http_client() -> None:
+    async with OpenCodeClient(base_url="http://127.0.0.1:4096") as client:
+        http_client = await client._get_client()
+        assert await client._get_client() is http_client
+
+    assert http_client.is_closed
+    assert client._client is None
+
+
+@pytest.mark.asyncio
+async def test_event_stream_stays_on_http1_when_requests_use_http2(monkeypatch) -> None:
+    monkeypatch.setattr("beeperclaw.opencode_client._HTTP2_AVAILABLE", True)
+    async with OpenCodeClient(base_url="https://opencode.example.org") as client:
+        requests_client = await client._get_client()
+        stream_client = await client._get_stream_client()
+
+        assert stream_client is not requests_client
+        assert requests_client._transport._pool._http2 is True  # type: ignore[attr-defined]
+        assert stream_client._transport._pool._http2 is False  # type: ignore[attr-defined]
+
+    assert stream_client.is_closed
+
+    plain = OpenCodeClient(base_url="http://127.0.0.1:4096")
+    assert await plain._get_stream_client() is await plain._get_client()
+    await plain.close()